@@ -1,7 +1,38 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 import yaml
 
+# Prefer the libyaml-backed C loader when available, falling back to the pure-Python one
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(path_str: str) -> dict:
+    """
+    Read and parse a YAML file, memoizing the result by absolute path.
+
+    Parameters
+    ----------
+    path_str : str
+        Resolved absolute path to the YAML file.
+
+    Returns
+    -------
+    dict
+        Parsed YAML content.
+    """
+    try:
+        # Open and read the file content safely
+        with open(path_str, "r", encoding="utf-8") as file:
+            return yaml.load(file, Loader=_LOADER)  # Parse YAML into a Python dictionary
+    except yaml.YAMLError as e:
+        # Raised if YAML parsing fails
+        raise yaml.YAMLError(f"Error parsing YAML file: {e}") from e
+    except IOError as e:
+        # Raised if file can't be read
+        raise IOError(f"Error reading YAML file: {e}") from e
+
 
 def load_yaml_config(file_path: Union[str, Path]) -> dict:
     """
@@ -25,6 +56,11 @@ def load_yaml_config(file_path: Union[str, Path]) -> dict:
         If there's an error parsing YAML.
     IOError
         If there's an error reading the file.
+
+    Notes
+    -----
+    - Parsed content is cached per resolved path, so repeated loads (e.g., on
+      Streamlit reruns) return the same dictionary. Callers must not mutate it.
     """
     # Ensure file_path is a Path object
     file_path = Path(file_path)
@@ -33,13 +69,4 @@ def load_yaml_config(file_path: Union[str, Path]) -> dict:
     if not file_path.exists():
         raise FileNotFoundError(f"YAML config file not found: {file_path}")
 
-    try:
-        # Open and read the file content safely
-        with open(file_path, "r", encoding="utf-8") as file:
-            return yaml.safe_load(file)  # Parse YAML into a Python dictionary
-    except yaml.YAMLError as e:
-        # Raised if YAML parsing fails
-        raise yaml.YAMLError(f"Error parsing YAML file: {e}") from e
-    except IOError as e:
-        # Raised if file can't be read
-        raise IOError(f"Error reading YAML file: {e}") from e
\ No newline at end of file
+    return _load_yaml_cached(str(file_path.resolve()))
@@ -10,12 +10,13 @@ MEMORY_DIR = os.path.join(ROOT_DIR, "memory")
 
 # Data subdirectories
 RAW_DATA_DIR = os.path.join(DATA_DIR, "raw")                    # Ex: places.csv, reviews.csv
-PROCESSED_DATA_DIR = os.path.join(DATA_DIR, "processed")        # Ex: places_reviews.json
+PROCESSED_DATA_DIR = os.path.join(DATA_DIR, "processed")        # Ex: places_reviews.json.gz
 VECTOR_DB_DIR = os.path.join(DATA_DIR, "chroma")                # ChromaDB SQLite
+MODELS_DIR = os.path.join(DATA_DIR, "models")                   # Exported/quantized embedding models
 
 # Files
 CHAT_HISTORY_DB_FPATH = os.path.join(MEMORY_DIR, "chat_history.db")
-JSON_PATH = os.path.join(PROCESSED_DATA_DIR, "places_reviews.json")
+JSON_PATH = os.path.join(PROCESSED_DATA_DIR, "places_reviews.json.gz")
 
 # Config files
 ENV_PATH = os.path.join(ROOT_DIR, ".env")
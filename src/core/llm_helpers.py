@@ -5,85 +5,94 @@ Utility functions for interacting with language models (LLMs).
 
 Functions
 ---------
-- count_tokens: Counts tokens in a text string using the appropriate tokenizer.
-- needs_history_context: Determines if a query depends on previous conversation history.
+- count_tokens: Counts tokens in one or more texts, encoding lists in a single batch call.
+- needs_markdown_fix: Checks whether a response shows common Markdown formatting issues.
 - fix_markdown_response: Cleans and improves Markdown formatting in LLM outputs.
 """
 
-import tiktoken
+import re
+from functools import lru_cache
+from typing import Union
+
 from langchain_core.messages import HumanMessage
 from utils.logger import setup_logger
 
 # Initialize logger for LLM helpers
 logger = setup_logger(name="llm_utils", log_filename="llm_utils.log")
 
+# Markdown issues typically introduced by machine translation: non-"-" bullets,
+# "-" markers glued to the item text, runs of asterisks and spaced-out bold markers
+# (an opening "**" at the start of a line or after whitespace, followed by a space)
+_MARKDOWN_ISSUE_PATTERN = re.compile(
+    r"(?m)^[ \t]*[*+•][ \t]|^[ \t]*-[^\s-]|\*{3,}|(?:^|(?<=\s))\*\*[ \t]+[^*\s][^*\n]*\*\*"
+)
+
 
-def count_tokens(text: str, model_name: str = "gpt-4") -> int:
+@lru_cache(maxsize=8)
+def _get_encoding(model_name: str):
     """
-    Count the number of tokens in a given text for a specific model.
+    Resolve and cache the tiktoken encoding for a given model.
 
     Parameters
     ----------
-    text : str
-        The input text to be tokenized.
-    model_name : str, optional
-        Model name used to select the tokenizer (default is "gpt-4").
+    model_name : str
+        Model name used to select the tokenizer.
 
     Returns
     -------
-    int
-        Total number of tokens in the text.
-
-    Notes
-    -----
-    Falls back to the 'cl100k_base' encoding if the model is not recognized.
+    tiktoken.Encoding
+        The encoding for the model, or 'cl100k_base' if the model is not recognized.
     """
+    import tiktoken  # Deferred until a tokenizer is first needed
+
     try:
-        encoding = tiktoken.encoding_for_model(model_name)  # Select tokenizer for the model
+        return tiktoken.encoding_for_model(model_name)  # Select tokenizer for the model
     except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")  # Fallback encoding
-    tokens = encoding.encode(text)  # Tokenize the input
-    return len(tokens)
+        return tiktoken.get_encoding("cl100k_base")  # Fallback encoding
 
 
-def needs_history_context(query: str, last_turn: str, llm_client) -> bool:
+def count_tokens(texts: Union[str, list[str]], model_name: str = "gpt-4") -> int:
     """
-    Determine whether the current user query depends on previous chat history.
+    Count the number of tokens in one or more texts for a specific model.
 
     Parameters
     ----------
-    query : str
-        The user's current question.
-    last_turn : str
-        The last Q/A pair from the conversation.
-    llm_client : Any
-        The language model client used to evaluate the dependency.
+    texts : str or list of str
+        The input text, or a list of texts (e.g., chat messages), to be tokenized.
+    model_name : str, optional
+        Model name used to select the tokenizer (default is "gpt-4").
 
     Returns
     -------
-    bool
-        True if the current query requires prior context, False otherwise.
+    int
+        Total number of tokens across all texts.
 
     Notes
     -----
-    Sends a prompt asking the LLM if history is needed and expects "SIM" or "NÃO" in response.
+    Falls back to the 'cl100k_base' encoding if the model is not recognized.
+    Encodings are cached per model name, so repeated calls skip tokenizer resolution.
+    Special tokens are not parsed; lists are encoded in a single batch call.
     """
-    check_prompt = f"""
-    O usuário fez a pergunta: "{query}"
+    if isinstance(texts, str):
+        texts = [texts]
+    return sum(len(tokens) for tokens in _get_encoding(model_name).encode_ordinary_batch(texts))
 
-    Ela depende do seguinte histórico para ser compreendida?
-    Histórico:
-    "{last_turn}"
 
-    Responda apenas com "SIM" ou "NÃO".
+def needs_markdown_fix(text: str) -> bool:
     """
+    Check whether a response shows common Markdown formatting issues.
 
-    try:
-        response = llm_client.invoke([HumanMessage(content=check_prompt)])
-        return "sim" in response.content.strip().lower()  # Normalize response and check
-    except Exception as e:
-        logger.warning(f"Error checking history dependency: {e}", exc_info=True)
-        return False
+    Parameters
+    ----------
+    text : str
+        The response text to inspect.
+
+    Returns
+    -------
+    bool
+        True if the text should be passed through `fix_markdown_response`.
+    """
+    return _MARKDOWN_ISSUE_PATTERN.search(text) is not None
 
 
 def fix_markdown_response(raw_response: str, llm_client) -> str:
@@ -1,12 +1,31 @@
 import sqlite3
+import streamlit as st
 from langchain.memory import ConversationBufferMemory
-from langchain_community.chat_message_histories.sql import SQLChatMessageHistory
+from sqlalchemy import create_engine, event, text
 from config.paths import CHAT_HISTORY_DB_FPATH
 from utils.logger import setup_logger
 
 # Create a logger for the "memory" module that writes to "memory.log"
 logger = setup_logger(name="memory", log_filename="memory.log")
 
+# Shared engine so every session reuses the same connection pool
+_ENGINE = create_engine(
+    f"sqlite:///{CHAT_HISTORY_DB_FPATH}",
+    connect_args={"check_same_thread": False},
+)
+
+
+@event.listens_for(_ENGINE, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply per-connection SQLite settings suited to WAL mode."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
+# Tracks whether the chat table has already been checked in this process
+_TABLE_READY = False
+
 
 def ensure_chat_table():
     """
@@ -19,6 +38,9 @@ def ensure_chat_table():
     -----
     - Uses the database file path defined in `CHAT_HISTORY_DB_FPATH`.
     - The table stores session_id, message content, and timestamp.
+    - Runs only once per process; subsequent calls are no-ops.
+    - Switches the database to WAL journal mode on first run.
+    - Creates an index on `session_id` if it does not already exist.
     - Logs success or failure of the operation.
 
     Raises
@@ -26,11 +48,18 @@ def ensure_chat_table():
     Exception
         If an error occurs during database connection or table creation.
     """
+    global _TABLE_READY
+    if _TABLE_READY:
+        return
+
     try:
         logger.debug(f"Connecting to SQLite DB at {CHAT_HISTORY_DB_FPATH} to ensure chat table exists.")
         conn = sqlite3.connect(CHAT_HISTORY_DB_FPATH)  # Connect to SQLite database
         cursor = conn.cursor()
 
+        # WAL mode is persisted in the DB file and speeds up frequent small inserts
+        cursor.execute("PRAGMA journal_mode=WAL")
+
         # Create the 'message_store' table if it does not exist
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS message_store (
@@ -41,15 +70,38 @@ def ensure_chat_table():
             )
         """)
 
+        # Index session lookups so loading and clearing a session avoid full table scans
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_message_store_session_id ON message_store (session_id)")
+
         conn.commit()
         conn.close()
 
+        _TABLE_READY = True
         logger.info("Table 'message_store' checked or created successfully.")
     except Exception as e:
         logger.exception(f"Failed to check/create 'message_store' table: {e}")
         raise
 
 
+def delete_session_messages(session_id: str) -> None:
+    """
+    Delete all stored chat messages for a given session.
+
+    Parameters
+    ----------
+    session_id : str
+        The session identifier whose messages should be deleted.
+
+    Notes
+    -----
+    - Runs on the shared engine, so no new SQLite connection is opened per call.
+    - The table `message_store` must exist with a `session_id` column.
+    """
+    with _ENGINE.begin() as conn:
+        conn.execute(text("DELETE FROM message_store WHERE session_id = :session_id"), {"session_id": session_id})
+
+
+@st.cache_resource(show_spinner=False)
 def get_memory(session_id: str = "default") -> ConversationBufferMemory:
     """
     Initialize and return a persistent conversation memory object for a given session.
@@ -72,14 +124,21 @@ def get_memory(session_id: str = "default") -> ConversationBufferMemory:
     -----
     - Relies on SQLite database file at `CHAT_HISTORY_DB_FPATH`.
     - Uses SQLChatMessageHistory to interface with the database.
+    - All sessions share a single module-level SQLAlchemy engine.
+    - Cached per `session_id` with `st.cache_resource`, so Streamlit reruns and the
+      RAG assistant reuse the same memory object. Messages are still read from
+      SQLite on each load, so clearing the table is reflected immediately.
     """
     logger.debug(f"Initializing persistent memory for session_id: '{session_id}'")
 
     ensure_chat_table()  # Make sure the chat message table exists
 
-    # Create SQLChatMessageHistory tied to the session and database connection
+    # Imported lazily; the SQL history integration is only needed once memory is requested
+    from langchain_community.chat_message_histories.sql import SQLChatMessageHistory
+
+    # Create SQLChatMessageHistory tied to the session and the shared engine
     history = SQLChatMessageHistory(
-        connection=f"sqlite:///{CHAT_HISTORY_DB_FPATH}",
+        connection=_ENGINE,
         session_id=session_id,
     )
 
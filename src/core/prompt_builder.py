@@ -1,6 +1,28 @@
 from typing import Dict, Any, Optional
 
 
+def _format_list(content: list) -> str:
+    """Format list items as bullet lines."""
+    return "\n".join([f"- {item}" for item in content])
+
+
+def _format_dict(content: dict) -> str:
+    """Format dictionary entries as "key: value" bullet lines."""
+    return "\n".join([f"- {key}: {value}" for key, value in content.items()])
+
+
+def _format_scalar(content: Any) -> str:
+    """Format a single value as one bullet line."""
+    return f"- {content}"
+
+
+# Section formatters dispatched on the exact content type; anything else is a scalar
+_SECTION_FORMATTERS = {
+    list: _format_list,
+    dict: _format_dict,
+}
+
+
 def format_prompt_section(title: str, content: any) -> str:
     """
     Format a titled section of the prompt for better readability.
@@ -17,27 +39,18 @@ def format_prompt_section(title: str, content: any) -> str:
     str
         Formatted string representing the section.
     """
-    if isinstance(content, list):
-        return f"{title}\n" + "\n".join(f"- {item}" for item in content)
-    elif isinstance(content, dict):
-        return f"{title}\n" + "\n".join(f"- {key}: {value}" for key, value in content.items())
-    else:
-        return f"{title}\n- {content}"
+    formatter = _SECTION_FORMATTERS.get(type(content), _format_scalar)
+    return f"{title}\n" + formatter(content)
 
 
-def build_prompt_from_config(config, documents, query, app_config=None, reasoning_instruction=None):
+def build_prompt_prefix(config, app_config=None, reasoning_instruction=None):
     """
-    Build a complete prompt string using the prompt configuration,
-    retrieved documents, user query, and optional reasoning instructions.
+    Build the static part of the prompt that does not depend on the query.
 
     Parameters
     ----------
     config : dict
         Prompt configuration dictionary (e.g., prompt_config["rag_assistant_prompt"]).
-    documents : list[str]
-        List of retrieved and formatted reviews.
-    query : str
-        The user's input question.
     app_config : dict, optional
         Full application config dictionary (not required if reasoning_instruction provided).
     reasoning_instruction : str, optional
@@ -46,9 +59,13 @@ def build_prompt_from_config(config, documents, query, app_config=None, reasonin
     Returns
     -------
     str
-        Fully formatted prompt to send to the language model.
+        Role, style, instruction, constraints, format and reasoning sections.
+
+    Notes
+    -----
+    - Depends only on configuration, so callers can build it once and pass it
+      to `build_prompt_from_config` on every query.
     """
-    context = "\n".join(documents)
     sections = []
 
     # Prompt structure
@@ -64,10 +81,41 @@ def build_prompt_from_config(config, documents, query, app_config=None, reasonin
     # Otherwise, fallback to app_config for CoT if available
     elif app_config and "reasoning_strategies" in app_config and "CoT" in app_config["reasoning_strategies"]:
         cot_instruction = app_config["reasoning_strategies"]["CoT"]
-        sections.append(format_prompt_section("Reasoning Strategy:", cot_instruction))        
+        sections.append(format_prompt_section("Reasoning Strategy:", cot_instruction))
 
-    # Add context and query
-    sections.append("Context:\n" + context)
-    sections.append("User's question:\n" + query)
+    return "\n\n".join(sections)
+
+
+def build_prompt_from_config(config, documents, query, app_config=None, reasoning_instruction=None, prefix=None):
+    """
+    Build a complete prompt string using the prompt configuration,
+    retrieved documents, user query, and optional reasoning instructions.
 
-    return "\n\n".join(sections)
\ No newline at end of file
+    Parameters
+    ----------
+    config : dict
+        Prompt configuration dictionary (e.g., prompt_config["rag_assistant_prompt"]).
+    documents : list[str]
+        List of retrieved and formatted reviews.
+    query : str
+        The user's input question.
+    app_config : dict, optional
+        Full application config dictionary (not required if reasoning_instruction provided).
+    reasoning_instruction : str, optional
+        Reasoning strategy instruction to inject into the prompt (e.g., Chain-of-Thought).
+    prefix : str, optional
+        Precomputed output of `build_prompt_prefix`. Built from the other
+        arguments when not provided.
+
+    Returns
+    -------
+    str
+        Fully formatted prompt to send to the language model.
+    """
+    if prefix is None:
+        prefix = build_prompt_prefix(config, app_config, reasoning_instruction)
+
+    context = "\n".join(documents)
+
+    # Add context and query
+    return prefix + "\n\nContext:\n" + context + "\n\nUser's question:\n" + query
@@ -5,19 +5,17 @@ Module implementing the RAGAssistant class for retrieval-augmented generation
 using vector search, prompt building, persistent memory, and LLM interaction.
 """
 
-import os
-from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+from concurrent.futures import ThreadPoolExecutor
+
 from langchain_core.messages import HumanMessage
 
 from utils.logger import setup_logger
 from utils.translator import detect_language, translate
-from data_processing.build_db import get_db_collection, embed_review_chunks
-from .prompt_builder import build_prompt_from_config
+from .prompt_builder import build_prompt_prefix, build_prompt_from_config
 from .memory import get_memory
 from .llm_helpers import (
     count_tokens,
-    needs_history_context,
+    needs_markdown_fix,
     fix_markdown_response,
 )
 
@@ -44,8 +42,22 @@ class RAGAssistant:
         Identifier of the LLM model to use.
     memory : ConversationBufferMemory
         Conversation memory for storing past messages.
+    executor : concurrent.futures.ThreadPoolExecutor
+        Worker pool used to run vector retrieval concurrently with memory loading.
     llm_client : Any
         LLM client instance for generating completions.
+    threshold : float
+        Cosine distance threshold for retrieval, from the `vectordb` config.
+    n_results : int
+        Number of documents to retrieve, from the `vectordb` config.
+    window_size : int
+        Number of recent Q/A pairs kept from chat memory.
+    max_tokens : int
+        Token limit that triggers chat history summarization.
+    reasoning_instruction : str
+        Instruction text of the default reasoning strategy.
+    prompt_prefix : str
+        Static prompt sections built once from the configuration.
     """
 
     def __init__(self, collection, embed_func, prompt_config, app_config, model_name, session_id="default"):
@@ -72,9 +84,36 @@ class RAGAssistant:
         self.prompt_config = prompt_config
         self.app_config = app_config
         self.model_name = model_name
+        # Imported lazily to keep the Groq client stack out of module import time
+        from langchain_groq import ChatGroq
+
         self.llm_client = ChatGroq(model=model_name)
         self.memory = get_memory(session_id)
 
+        # Worker threads used to overlap vector retrieval with memory loading
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rag_io")
+
+        # Resolve vector retrieval and memory settings once instead of on every turn
+        vectordb_config = app_config.get("vectordb", {})
+        memory_config = app_config.get("memory_strategies", {})
+        self.threshold = vectordb_config.get("threshold", 0.3)
+        self.n_results = vectordb_config.get("n_results", 5)
+        self.window_size = memory_config.get("trimming_window_size", 6)
+        self.max_tokens = memory_config.get("summarization_max_tokens", 1000)
+
+        # Get default reasoning strategy name from config (e.g., "CoT")
+        strategy_name = app_config.get("reasoning_strategies", {}).get("default", "CoT")
+
+        # Get reasoning instruction text for the chosen strategy
+        self.reasoning_instruction = app_config.get("reasoning_strategies", {}).get(strategy_name, "")
+
+        # The static prompt sections depend only on config, so build them once
+        self.prompt_prefix = build_prompt_prefix(
+            config=prompt_config,
+            app_config=app_config,
+            reasoning_instruction=self.reasoning_instruction,
+        )
+
         logger.info(f"RAGAssistant initialized with model '{model_name}' and session '{session_id}'")
 
 
@@ -94,14 +133,13 @@ class RAGAssistant:
         str
             Formatted string with metadata and review content.
         """
-        name = meta.get("name", "Unknown name")
-        rating = meta.get("place_rating", "N/A")
-        street = meta.get("street", "No street provided")
-        neighborhood = meta.get("neighborhood", "No neighborhood provided")
-        city = meta.get("city", "No city provided")
+        get = meta.get  # Bind once; metadata keys may be missing, so defaults are kept
 
         return (
-            f"{name} (Rating: {rating}) — {street}, {neighborhood}, {city}\n"
+            f"{get('name', 'Unknown name')} (Rating: {get('place_rating', 'N/A')}) — "
+            f"{get('street', 'No street provided')}, "
+            f"{get('neighborhood', 'No neighborhood provided')}, "
+            f"{get('city', 'No city provided')}\n"
             f"Review: {doc.strip()}"
         )
 
@@ -145,12 +183,13 @@ class RAGAssistant:
             logger.warning("No documents returned from vector search.")
             return []
 
-        # Filter documents based on distance threshold
-        relevant = []
-        for doc, dist, meta in zip(results["documents"][0], results["distances"][0], results["metadatas"][0]):
-            if dist < threshold:
-                formatted = self.format_review(doc, meta)
-                relevant.append(formatted)
+        # Filter documents based on distance threshold and format them in a single pass
+        format_review = self.format_review
+        relevant = [
+            format_review(doc, meta)
+            for doc, dist, meta in zip(results["documents"][0], results["distances"][0], results["metadatas"][0])
+            if dist < threshold
+        ]
 
         logger.debug(f"Found {len(relevant)} relevant documents under threshold {threshold}.")
         return relevant
@@ -166,11 +205,10 @@ class RAGAssistant:
         2. Retrieves relevant review documents from a vector store based on similarity to the query.
         3. Loads past conversation history from memory.
         4. Optionally summarizes the history if it exceeds token limits.
-        5. Determines whether chat history is required for proper understanding.
-        6. Builds a context-enriched prompt using configuration templates.
-        7. Sends the prompt to the LLM and obtains a response.
-        8. Optionally translates the response to match the user's input language.
-        9. Formats the response with corrected Markdown syntax.
+        5. Builds a context-enriched prompt using configuration templates.
+        6. Sends the prompt to the LLM and obtains a response.
+        7. Optionally translates the response to match the user's input language.
+        8. Formats the response with corrected Markdown syntax.
 
         Parameters
         ----------
@@ -197,26 +235,29 @@ class RAGAssistant:
         detected_lang = detect_language(query)
         logger.info(f"Detected language: {detected_lang}")
 
-        # Load vector retrieval config from app_config
-        threshold = self.app_config.get("vectordb", {}).get("threshold", 0.3)
-        n_results = self.app_config.get("vectordb", {}).get("n_results", 5)
-        
-        # Retrieve relevant reviews
-        relevant_reviews = self.retrieve_relevant_reviews(query, n_results, threshold)
+        # Retrieve relevant reviews in the background (embedding + vector DB query),
+        # using the vector retrieval config from app_config
+        reviews_future = self.executor.submit(
+            self.retrieve_relevant_reviews, query, self.n_results, self.threshold
+        )
 
-        # Load chat memory and apply trimming strategy
+        # Meanwhile, load chat memory (SQLite read) and apply trimming strategy
         past_messages = self.memory.load_memory_variables({}).get("chat_history", [])
-        window_size = self.app_config.get("memory_strategies", {}).get("trimming_window_size", 6)
-        chat_history = past_messages[-(window_size * 2):]  # Keep last N Q&A pairs
-        logger.debug(f"Loaded {len(chat_history)} messages from memory (window size: {window_size}).")
+        chat_history = past_messages[-(self.window_size * 2):]  # Keep last N Q&A pairs
+        logger.debug(f"Loaded {len(chat_history)} messages from memory (window size: {self.window_size}).")
 
         # Summarize if token count exceeds the maximum
-        max_tokens = self.app_config.get("memory_strategies", {}).get("summarization_max_tokens", 1000)
-        chat_text = "\n".join(msg.content for msg in chat_history)
-        total_tokens = count_tokens(chat_text, model_name=self.model_name)
+        message_texts = [msg.content for msg in chat_history]
+
+        # Every BPE token spans at least one byte, so the byte length is an upper bound
+        # on the token count; only run the tokenizer when that bound exceeds the limit
+        total_tokens = sum(len(text.encode("utf-8")) for text in message_texts)
+        if total_tokens > self.max_tokens:
+            total_tokens = count_tokens(message_texts, model_name=self.model_name)
 
-        if total_tokens > max_tokens:
-            logger.info(f"Chat history exceeds {max_tokens} tokens ({total_tokens} tokens). Summarizing...")
+        if total_tokens > self.max_tokens:
+            logger.info(f"Chat history exceeds {self.max_tokens} tokens ({total_tokens} tokens). Summarizing...")
+            chat_text = "\n".join(message_texts)
 
             summarization_prompt = f"""
             Summarize the following chat history to preserve useful context for the next user query.
@@ -234,28 +275,8 @@ class RAGAssistant:
             except Exception as e:
                 logger.warning(f"Failed to summarize chat history: {e}", exc_info=True)
 
-        # Build context string from last Q&A pair for reasoning
-        last_turn = "\n".join(msg.content for msg in past_messages[-2:]) if len(past_messages) >= 2 else ""
-        use_history = needs_history_context(query, last_turn, self.llm_client) if last_turn else False
-
-        # Context string passed to prompt (if needed)
-        if use_history:
-            context = (
-                f"{chr(10).join(relevant_reviews)}\n\n"
-                f"Histórico:\n{last_turn}\n\n"
-                f"Nova pergunta:\n{query}"
-            )
-        else:
-            context = (
-                f"{chr(10).join(relevant_reviews)}\n\n"
-                f"Pergunta:\n{query}"
-            )        
-
-        # Get default reasoning strategy name from config (e.g., "CoT")
-        strategy_name = self.app_config.get("reasoning_strategies", {}).get("default", "CoT")
-        
-        # Get reasoning instruction text for the chosen strategy
-        reasoning_instruction = self.app_config.get("reasoning_strategies", {}).get(strategy_name, "")
+        # Wait for the background retrieval, which overlapped memory loading and summarization above
+        relevant_reviews = reviews_future.result()
 
         # Build a prompt that combines retrieved reviews, query, and reasoning strategy
         prompt = build_prompt_from_config(
@@ -263,7 +284,8 @@ class RAGAssistant:
             documents=relevant_reviews,
             query=query,
             app_config=self.app_config,
-            reasoning_instruction=reasoning_instruction
+            reasoning_instruction=self.reasoning_instruction,
+            prefix=self.prompt_prefix,
         )
 
         # Send the constructed prompt to the LLM for response generation
@@ -271,12 +293,21 @@ class RAGAssistant:
         logger.info("Sending context-enriched prompt to LLM")
         response = self.llm_client.invoke(full_messages)
 
-        # Optional translation
-        if detected_lang != "pt":
-            translated_response = translate(response.content, target_lang=detected_lang)
-            formatted_response = fix_markdown_response(translated_response, self.llm_client)
+        # Optional translation; answers stay in Portuguese when the language is unknown
+        if detected_lang not in ("pt", "unknown"):
+            try:
+                translated_response = translate(response.content, target_lang=detected_lang)
+            except Exception as e:
+                logger.warning(f"Failed to translate response to '{detected_lang}': {e}", exc_info=True)
+                return response.content
+
+            # Only spend an extra LLM call on Markdown cleanup when the translation broke it
+            if needs_markdown_fix(translated_response):
+                formatted_response = fix_markdown_response(translated_response, self.llm_client)
+            else:
+                formatted_response = translated_response
             logger.info(f"Translated response to: {detected_lang}")
             return formatted_response
 
-        # Return raw LLM output if language is Portuguese
+        # Return raw LLM output if language is Portuguese or could not be detected
         return response.content
\ No newline at end of file
@@ -1,13 +1,16 @@
+import streamlit as st
 from core.rag_assistant import RAGAssistant
 from data_processing.build_db import get_db_collection, embed_review_chunks
 from config.config_loader import load_yaml_config
 from config.paths import APP_CONFIG_FPATH, PROMPT_CONFIG_FPATH
 from utils.logger import setup_logger
+from utils.translator import ensure_lid_model
 
 # Initialize app logger writing to "app.log"
 logger = setup_logger(name="app", log_filename="app.log")
 
 
+@st.cache_resource(show_spinner=False)
 def load_rag_assistant():
     """
     Load and initialize the Retrieval-Augmented Generation (RAG) assistant.
@@ -30,9 +33,18 @@ def load_rag_assistant():
     - Assumes a ChromaDB instance with a collection named "reviews" exists.
     - Requires valid YAML config files at the specified APP_CONFIG_FPATH and PROMPT_CONFIG_FPATH.
     - The embedding function `embed_review_chunks` must be defined and compatible.
+    - Downloads the fastText language identification model if it is missing.
+    - The result is cached with `st.cache_resource`, so the assistant is built once
+      per server process instead of on every Streamlit rerun.
     """
     logger.info("Loading RAGAssistant and configurations.")
 
+    # Fetch the language identification model now rather than inside the first user request
+    try:
+        ensure_lid_model()
+    except Exception as e:
+        logger.warning(f"Could not download the language identification model: {e}", exc_info=True)
+
     # Load vector DB collection named "reviews"
     collection = get_db_collection(collection_name="reviews")
 
@@ -13,72 +13,122 @@ Note
 Requires ChromaDB, LangChain, and a HuggingFace-supported embedding model.
 """
 
-import json
+import gzip
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import chromadb
+import ijson
+import numpy as np
+import tiktoken
 import torch
-from config.paths import JSON_PATH, VECTOR_DB_DIR
-from langchain.text_splitter import TokenTextSplitter
+from config.paths import JSON_PATH, VECTOR_DB_DIR, MODELS_DIR
 from langchain_huggingface import HuggingFaceEmbeddings
 from utils.logger import setup_logger
 
 # Name of the ChromaDB collection used to store review embeddings
 COLLECTION_NAME = "reviews"
 
+# Multilingual sentence embedding model used for both reviews and queries
+EMBEDDING_MODEL_NAME = "sentence-transformers/distiluse-base-multilingual-cased-v2"
+
+# Number of texts per forward pass when encoding
+EMBEDDING_BATCH_SIZE = 64
+
+# Opt-in int8 ONNX inference on CPU (requires `sentence-transformers[onnx]`).
+# The vector DB must be built with the same setting used by the app.
+USE_ONNX_INT8 = os.getenv("EMBEDDINGS_ONNX_INT8", "0").lower() in ("1", "true", "yes")
+
+# Local directory and file name of the int8 dynamically quantized ONNX export
+ONNX_INT8_MODEL_DIR = os.path.join(MODELS_DIR, "distiluse-base-multilingual-cased-v2-onnx")
+ONNX_INT8_FILE_NAME = "onnx/model_qint8_avx512_vnni.onnx"
+
 # Initialize a logger for this module, writing to build_db.log
 logger = setup_logger(name="build_db", log_filename="build_db.log")
 
 
-def load_reviews_and_metadata(json_path: str) -> List[Tuple[str, Dict]]:
+def load_reviews_and_metadata(json_path: str) -> Iterator[Tuple[str, Dict]]:
     """
-    Load review texts and associated metadata from a JSON file.
+    Stream review texts and associated metadata from a JSON file.
 
     Parameters
     ----------
     json_path : str
-        Path to the JSON file containing places and reviews.
+        Path to the JSON file containing places and reviews. Files ending in
+        '.gz' are read as gzip-compressed JSON.
+
+    Yields
+    ------
+    tuple
+        (review_text, metadata) pairs, one per non-empty review.
+
+    Notes
+    -----
+    - Places are parsed incrementally with `ijson`, so the whole file is never
+      held in memory at once.
+    - Missing (null) fields are left out of the metadata.
+    """
+    logger.info(f"Loading JSON from {json_path}")
+
+    count = 0
+    # Gzip-compressed files are decompressed on the fly while streaming
+    opener = gzip.open if str(json_path).endswith(".gz") else open
+    with opener(json_path, 'rb') as f:
+        for place in ijson.items(f, "item", use_float=True):
+            for review in place.get("reviews", []):
+                text = (review.get("text") or "").strip()
+                if not text:
+                    continue  # Skip empty reviews
+
+                # Build metadata for each review
+                metadata = {
+                    # Place fields
+                    "name": place.get("name"),
+                    "street": place.get("street"),
+                    "neighborhood": place.get("neighborhood"),
+                    "city": place.get("city"),
+                    "type": place.get("type"),
+                    "place_rating": place.get("rating"),
+
+                    # Review fields
+                    "review_rating": review.get("rating"),
+                    "author": review.get("author"),
+                    "date": review.get("date"),
+                    "response": review.get("response"),
+                }
+
+                # Store the review text along with its metadata
+                count += 1
+                yield text, {key: value for key, value in metadata.items() if value is not None}
+
+    logger.info(f"Loaded {count} reviews with metadata")
+
+
+@lru_cache(maxsize=4)
+def get_db_client(persist_directory: str) -> chromadb.ClientAPI:
+    """
+    Open a persistent ChromaDB client once per directory.
+
+    Parameters
+    ----------
+    persist_directory : str
+        Path where ChromaDB data is stored.
 
     Returns
     -------
-    list of tuple
-        A list of (review_text, metadata) tuples.
+    chromadb.ClientAPI
+        The cached client for that directory.
+
+    Notes
+    -----
+    - Reusing the client avoids reopening SQLite and the HNSW segments on
+      every call.
     """
-    logger.info(f"Loading JSON from {json_path}")
-    with open(json_path, 'r', encoding='utf-8') as f:
-        places = json.load(f)
-
-    reviews_with_metadata = []
-    for place in places:
-        for review in place.get("reviews", []):
-            text = review.get("text", "").strip()
-            if not text:
-                continue  # Skip empty reviews
-
-            # Build metadata for each review
-            metadata = {
-                # Place fields
-                "name": place.get("name"),
-                "street": place.get("street"),
-                "neighborhood": place.get("neighborhood"),
-                "city": place.get("city"),
-                "type": place.get("type"),
-                "place_rating": place.get("rating"),
-
-                # Review fields
-                "review_rating": review.get("rating"),
-                "author": review.get("author"),
-                "date": review.get("date"),
-                "response": review.get("response"),
-            }
-
-            # Store the review text along with its metadata    
-            reviews_with_metadata.append((text, metadata))
-
-    logger.info(f"Loaded {len(reviews_with_metadata)} reviews with metadata")
-    return reviews_with_metadata
+    return chromadb.PersistentClient(path=persist_directory)
 
 
 def initialize_db(persist_directory: str, collection_name: str, delete_existing: bool = False) -> chromadb.Collection:
@@ -102,13 +152,14 @@ def initialize_db(persist_directory: str, collection_name: str, delete_existing:
     if os.path.exists(persist_directory) and delete_existing:
         logger.info(f"Deleting existing ChromaDB directory at {persist_directory}")
 
-        # Remove existing database directory if requested
+        # Remove existing database directory if requested, dropping any client opened on it
+        get_db_client.cache_clear()
         shutil.rmtree(persist_directory)
 
     os.makedirs(persist_directory, exist_ok=True)
 
-    # Create a ChromaDB client with persistent storage
-    client = chromadb.PersistentClient(path=persist_directory)
+    # Get the ChromaDB client with persistent storage
+    client = get_db_client(persist_directory)
 
     try:
         # Try to load existing collection
@@ -144,55 +195,163 @@ def get_db_collection(
     chromadb.Collection
         The existing collection.
     """
-    client = chromadb.PersistentClient(path=persist_directory)
+    client = get_db_client(persist_directory)
     return client.get_collection(name=collection_name)
 
 
 def chunk_reviews_by_tokens(
-    reviews_with_metadata: List[Tuple[str, Dict]],
+    reviews_with_metadata: Iterable[Tuple[str, Dict]],
     chunk_size: int = 256,
     chunk_overlap: int = 32,
-    encoding_name: str = "cl100k_base"
-) -> List[Tuple[str, Dict]]:
+    encoding_name: str = "cl100k_base",
+    batch_size: int = 1000
+) -> Iterator[Tuple[str, Dict]]:
     """
     Split review texts into chunks based on token count.
 
     Parameters
     ----------
-    reviews_with_metadata : list of tuple
-        List of (review_text, metadata) entries.
+    reviews_with_metadata : iterable of tuple
+        (review_text, metadata) entries, e.g. from `load_reviews_and_metadata`.
     chunk_size : int
         Maximum number of tokens per chunk.
     chunk_overlap : int
         Number of overlapping tokens between chunks.
     encoding_name : str
         Encoding used to count tokens (compatible with tiktoken).
+    batch_size : int
+        Number of reviews tokenized and decoded per batch.
+
+    Yields
+    ------
+    tuple
+        (chunk_text, metadata) entries with token-based splitting.
+
+    Notes
+    -----
+    - Chunk boundaries match LangChain's `TokenTextSplitter`; special tokens
+      are not parsed.
+    """
+    if chunk_overlap >= chunk_size:
+        raise ValueError(f"chunk_overlap ({chunk_overlap}) must be smaller than chunk_size ({chunk_size})")
+
+    encoding = tiktoken.get_encoding(encoding_name)
+    stride = chunk_size - chunk_overlap
+
+    num_reviews = 0
+    num_chunks = 0
+    review_iter = iter(reviews_with_metadata)
+    while batch := list(islice(review_iter, batch_size)):
+        num_reviews += len(batch)
+
+        # Tokenize the whole batch in one multi-threaded call
+        token_ids = encoding.encode_ordinary_batch([text for text, _ in batch], num_threads=os.cpu_count() or 1)
+
+        # Slice each review into overlapping token windows, ending at the first window that reaches the end
+        chunk_ids = []
+        chunk_metas = []
+        for ids, (_, metadata) in zip(token_ids, batch):
+            for i, start in enumerate(range(0, max(len(ids) - chunk_overlap, min(len(ids), 1)), stride)):
+                chunk_meta = metadata.copy()     # Keep original metadata
+                chunk_meta["chunk_index"] = i    # Add chunk index
+                chunk_ids.append(ids[start:start + chunk_size])
+                chunk_metas.append(chunk_meta)
+
+        # Decode all chunks of the batch at once
+        for chunk, chunk_meta in zip(encoding.decode_batch(chunk_ids), chunk_metas):
+            num_chunks += 1
+            yield chunk, chunk_meta
+
+    logger.info(f"Generated {num_chunks} chunks from {num_reviews} reviews")
+
+
+def _export_onnx_int8_model() -> None:
+    """
+    Export the embedding model to ONNX and apply int8 dynamic quantization.
+
+    Notes
+    -----
+    - Only the transformer is exported; pooling and the dense projection layer
+      stay in PyTorch, so the embedding dimension is unchanged.
+    - Runs once; later loads reuse the model saved in `ONNX_INT8_MODEL_DIR`.
+    """
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+
+    logger.info(f"Exporting int8 ONNX embedding model to {ONNX_INT8_MODEL_DIR}")
+    onnx_model = SentenceTransformer(EMBEDDING_MODEL_NAME, backend="onnx", device="cpu")
+    onnx_model.save(ONNX_INT8_MODEL_DIR)
+    export_dynamic_quantized_onnx_model(onnx_model, "avx512_vnni", ONNX_INT8_MODEL_DIR)
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model() -> HuggingFaceEmbeddings:
+    """
+    Load the sentence embedding model once per process.
 
     Returns
     -------
-    list of tuple
-        List of (chunk_text, metadata) entries with token-based splitting.
+    HuggingFaceEmbeddings
+        The multilingual embedding model placed on the best available device.
+
+    Notes
+    -----
+    - The model is cached, so building the database and embedding queries
+      reuse the same loaded weights instead of reloading them per call.
+    - On CPU, setting `EMBEDDINGS_ONNX_INT8=1` runs an int8 quantized ONNX
+      export of the model through onnxruntime. GPUs keep the PyTorch model.
     """
-    splitter = TokenTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        encoding_name=encoding_name
+    # Automatically select best available device: CUDA > MPS > CPU
+    device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
+
+    if device == "cpu" and USE_ONNX_INT8:
+        if not os.path.exists(os.path.join(ONNX_INT8_MODEL_DIR, ONNX_INT8_FILE_NAME)):
+            _export_onnx_int8_model()
+
+        logger.info("Loading int8 ONNX embedding model on device: cpu")
+        return HuggingFaceEmbeddings(
+            model_name=ONNX_INT8_MODEL_DIR,
+            model_kwargs={
+                "device": device,
+                "backend": "onnx",
+                "model_kwargs": {"file_name": ONNX_INT8_FILE_NAME, "provider": "CPUExecutionProvider"},
+            },
+            encode_kwargs={"batch_size": EMBEDDING_BATCH_SIZE},
+        )
+
+    logger.info(f"Loading embedding model on device: {device}")
+
+    # Load multilingual sentence embedding model. SentenceTransformer.encode sorts
+    # inputs by length before batching, so each batch is padded only to similar lengths
+    return HuggingFaceEmbeddings(
+        model_name=EMBEDDING_MODEL_NAME,
+        model_kwargs={"device": device},
+        encode_kwargs={"batch_size": EMBEDDING_BATCH_SIZE},
     )
 
-    chunked_reviews = []
-    for review_text, metadata in reviews_with_metadata:
-        # Split text into smaller overlapping chunks
-        chunks = splitter.split_text(review_text)
-        for i, chunk in enumerate(chunks):
-            chunk_meta = metadata.copy()         # Keep original metadata
-            chunk_meta["chunk_index"] = i        # Add chunk index
-            chunked_reviews.append((chunk, chunk_meta))
 
-    logger.info(f"Generated {len(chunked_reviews)} chunks from {len(reviews_with_metadata)} reviews")
-    return chunked_reviews
+def _autocast_dtype(device: str) -> Optional[torch.dtype]:
+    """
+    Pick the reduced-precision dtype used to autocast the embedding forward pass.
 
+    Parameters
+    ----------
+    device : str
+        Device the embedding model runs on ("cuda", "mps" or "cpu").
 
-def embed_review_chunks(review_chunks: List[str]) -> List[List[float]]:
+    Returns
+    -------
+    torch.dtype or None
+        bfloat16 on CUDA GPUs that support it, float16 on MPS, None otherwise.
+    """
+    if device == "cuda" and torch.cuda.is_bf16_supported():
+        return torch.bfloat16
+    if device == "mps":
+        return torch.float16
+    return None
+
+
+def embed_review_chunks(review_chunks: List[str], model: Optional[HuggingFaceEmbeddings] = None) -> np.ndarray:
     """
     Generate embeddings for a list of review chunks.
 
@@ -200,71 +359,119 @@ def embed_review_chunks(review_chunks: List[str]) -> List[List[float]]:
     ----------
     review_chunks : list of str
         Review chunk texts.
+    model : HuggingFaceEmbeddings, optional
+        Embedding model to use. Defaults to the shared model from `get_embedding_model`.
 
     Returns
     -------
-    list of list of float
-        Embeddings represented as lists of floats.
-    """
-    # Automatically select best available device: CUDA > MPS > CPU
-    device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
-    logger.info(f"Embedding chunks on device: {device}")
+    np.ndarray
+        float32 array of shape (len(review_chunks), embedding_dim), one row per chunk.
 
-    # Load multilingual sentence embedding model
-    model = HuggingFaceEmbeddings(
-        model_name="sentence-transformers/distiluse-base-multilingual-cased-v2",
-        model_kwargs={"device": device},
-    )
-
-    # Generate vector representations for each chunk
-    logger.info(f"Generated embeddings for {len(review_chunks)} chunks")
-    return model.embed_documents(review_chunks)
+    Notes
+    -----
+    - On CUDA the forward pass runs under bfloat16 autocast (float16 on MPS);
+      returned embeddings are still float32.
+    - The underlying SentenceTransformer is called directly, skipping the
+      tensor-to-list conversion done by `embed_documents`.
+    - Identical chunk texts (e.g. short "Ótimo!" reviews) are embedded only once.
+    """
+    if model is None:
+        model = get_embedding_model()
+
+    # Same input normalization as `HuggingFaceEmbeddings.embed_documents`, then
+    # map each chunk to the position of its first identical text
+    unique_index: Dict[str, int] = {}
+    order = [unique_index.setdefault(text.replace("\n", " "), len(unique_index)) for text in review_chunks]
+    texts = list(unique_index)
+
+    # Generate vector representations for each chunk, autocasting the matmuls on GPU
+    device = model.model_kwargs.get("device", "cpu")
+    dtype = _autocast_dtype(device)
+    with torch.inference_mode(), torch.autocast(device, dtype=dtype, enabled=dtype is not None):
+        embeddings = model._client.encode(
+            texts,
+            show_progress_bar=model.show_progress,
+            convert_to_numpy=True,
+            **model.encode_kwargs,
+        )
+    # Fan the unique vectors back out to every chunk
+    embeddings = np.asarray(embeddings, dtype=np.float32)[order]
+    logger.info(f"Generated embeddings for {len(review_chunks)} chunks ({len(texts)} unique)")
+    return embeddings
 
 
 def insert_review_chunks(
     collection: chromadb.Collection,
-    chunked_reviews: List[Tuple[str, Dict]],
+    chunked_reviews: Iterable[Tuple[str, Dict]],
+    embedder: HuggingFaceEmbeddings,
     batch_size: int = 5000
 ) -> None:
     """
-    Insert review chunks and their embeddings into ChromaDB in batches.
+    Embed review chunks and insert them into ChromaDB in batches.
 
     Parameters
     ----------
     collection : chromadb.Collection
         The ChromaDB collection to insert into.
-    chunked_reviews : list of tuple
-        List of (chunk_text, metadata) entries.
+    chunked_reviews : iterable of tuple
+        (chunk_text, metadata) entries, e.g. from `chunk_reviews_by_tokens`.
+    embedder : HuggingFaceEmbeddings
+        Embedding model, loaded once by the caller.
     batch_size : int
-        Number of entries to insert per batch.
+        Number of entries to embed and insert per batch.
 
     Returns
     -------
     None
-    """
-    total = len(chunked_reviews)
-    logger.info(f"Inserting {total} chunks into ChromaDB in batches of {batch_size}")
-
-    for start in range(0, total, batch_size):
-        end = min(start + batch_size, total)
-        batch = chunked_reviews[start:end]
 
-        # Prepare data for insertion
-        review_chunks = [text for text, _ in batch]
-        metadatas = [meta for _, meta in batch]
-        embeddings = embed_review_chunks(review_chunks)
-        ids = [f"chunk_{i}" for i in range(start, end)]  # Generate unique IDs for each chunk
+    Notes
+    -----
+    - Chunks are consumed lazily, so only one batch is embedded at a time.
+    - Each batch is inserted on a background thread while the next one is
+      embedded; at most one insert is in flight.
+    """
+    logger.info(f"Inserting chunks into ChromaDB in batches of {batch_size}")
 
+    def add_batch(start: int, end: int, **batch_data) -> None:
         # Add batch to ChromaDB
-        collection.add(
-            documents=review_chunks,
-            embeddings=embeddings,
-            ids=ids,
-            metadatas=metadatas
-        )
-
+        collection.add(**batch_data)
         logger.info(f"Inserted batch {start}–{end}")
 
+    chunk_iter = iter(chunked_reviews)
+    start = 0
+    pending_add = None
+
+    # A single writer thread runs collection.add while the next batch is being embedded
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chroma_add") as executor:
+        while batch := list(islice(chunk_iter, batch_size)):
+            end = start + len(batch)
+
+            # Prepare data for insertion
+            review_chunks = [text for text, _ in batch]
+            metadatas = [meta for _, meta in batch]
+            embeddings = embed_review_chunks(review_chunks, model=embedder)
+            ids = [f"chunk_{i}" for i in range(start, end)]  # Generate unique IDs for each chunk
+
+            # Wait for the previous insert, so at most one batch is waiting to be written
+            if pending_add is not None:
+                pending_add.result()
+
+            # Insert the batch in the background while the next one is embedded
+            pending_add = executor.submit(
+                add_batch,
+                start,
+                end,
+                documents=review_chunks,
+                embeddings=embeddings,
+                ids=ids,
+                metadatas=metadatas
+            )
+            start = end
+
+        # Surface errors from the last insert
+        if pending_add is not None:
+            pending_add.result()
+
 
 def main() -> None:
     """
@@ -288,8 +495,11 @@ def main() -> None:
     # Initialize the ChromaDB collection (delete if already exists)
     collection = initialize_db(VECTOR_DB_DIR, COLLECTION_NAME, delete_existing=True)
 
+    # Load the embedding model once for the whole pipeline
+    embedder = get_embedding_model()
+
     # Insert the chunks and embeddings into the vector database
-    insert_review_chunks(collection, chunked_reviews)
+    insert_review_chunks(collection, chunked_reviews, embedder)
 
     total = collection.count()
     logger.info(f"Pipeline complete: {total} documents in collection")
@@ -1,11 +1,73 @@
-import json
+import gzip
 import os
 import sys
 from pathlib import Path
+import orjson
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 from config.paths import RAW_DATA_DIR, PROCESSED_DATA_DIR
 from utils.logger import setup_logger
 
+# CSV column -> JSON key mappings, in output order
+PLACE_COLUMNS = {
+    "Place ID": "place_id",
+    "Name": "name",
+    "Street": "street",
+    "Neighborhood": "neighborhood",
+    "City": "city",
+    "Rating": "rating",
+    "Number of Reviews": "num_reviews",
+    "Type": "type",
+    "Latitude": "latitude",
+    "Longitude": "longitude",
+}
+REVIEW_COLUMNS = {
+    "Review ID": "review_id",
+    "Author": "author",
+    "Rating": "rating",
+    "Text": "text",
+    "Review Length": "review_length",
+    "Word Count": "word_count",
+    "Time": "time",
+    "Date": "date",
+    "Response": "response",
+}
+
+
+# Columns kept as text instead of letting Arrow infer a timestamp
+STRING_COLUMNS = ["Date"]
+
+
+def read_csv(path: str) -> pd.DataFrame:
+    """
+    Read a ';'-separated CSV file with the multithreaded Arrow CSV reader.
+
+    Parameters
+    ----------
+    path : str
+        Path to the CSV file.
+
+    Returns
+    -------
+    pd.DataFrame
+        The parsed table, with empty fields as missing values.
+
+    Notes
+    -----
+    - Quoted fields may contain newlines (multi-line review texts).
+    - Columns listed in `STRING_COLUMNS` are read verbatim as strings.
+    """
+    table = pa_csv.read_csv(
+        path,
+        parse_options=pa_csv.ParseOptions(delimiter=";", newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={column: pa.string() for column in STRING_COLUMNS},
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
+
 
 def generate_places_reviews_json(
     places_path: str,
@@ -29,6 +91,7 @@ def generate_places_reviews_json(
 
     output_path : str, optional
         Path to save the output JSON file. Defaults to 'places_reviews.json'.
+        Paths ending in '.gz' are written as gzip-compressed compact JSON.
 
     Returns
     -------
@@ -38,68 +101,49 @@ def generate_places_reviews_json(
     Notes
     -----
     - This function assumes both CSV files use ';' as a separator.
+    - Missing values are written as null.
     - Reviews are grouped by Place ID and embedded into their corresponding place entries.
     """
 
     # Read both CSV files
     logger.info(f"Loading places from: {places_path}")
-    places_df = pd.read_csv(places_path, sep=';')
+    places_df = read_csv(places_path)
     logger.info(f"Loaded {len(places_df)} places")
 
     logger.info(f"Loading reviews from: {reviews_path}")
-    reviews_df = pd.read_csv(reviews_path, sep=';')
+    reviews_df = read_csv(reviews_path)
     logger.info(f"Loaded {len(reviews_df)} reviews")
 
-    # Group reviews by Place ID for faster lookup
-    grouped_reviews = reviews_df.groupby("Place ID")
-
-    # Final output list
-    result = []
-
-    # Iterate through each place
-    for idx, place in places_df.iterrows():
-        place_id = place["Place ID"]
-
-        # Extract all reviews associated with this place
-        reviews = []
-        if place_id in grouped_reviews.groups:
-            place_reviews = grouped_reviews.get_group(place_id)
-            for _, review in place_reviews.iterrows():
-                reviews.append({
-                    "review_id": review.get("Review ID"),
-                    "author": review.get("Author"),
-                    "rating": review.get("Rating"),
-                    "text": review.get("Text"),
-                    "review_length": review.get("Review Length"),
-                    "word_count": review.get("Word Count"),
-                    "time": review.get("Time"),
-                    "date": review.get("Date"),
-                    "response": review.get("Response")
-                })
-        else:
-            logger.warning(f"No reviews found for place_id: {place_id} ({place.get('Name')})")                
-
-        # Create JSON object for the place
-        result.append({
-            "place_id": place_id,
-            "name": place.get("Name"),
-            "street": place.get("Street"),
-            "neighborhood": place.get("Neighborhood"),
-            "city": place.get("City"),
-            "rating": place.get("Rating"),
-            "num_reviews": place.get("Number of Reviews"),
-            "type": place.get("Type"),
-            "latitude": place.get("Latitude"),
-            "longitude": place.get("Longitude"),
-            "reviews": reviews
-        })
-
-        if idx % 100 == 0 and idx > 0:
-            logger.info(f"Processed {idx} places")        
-
-    # Write result to JSON file
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    # Keep and rename the expected columns (missing ones are filled with NaN)
+    places_df = places_df.reindex(columns=list(PLACE_COLUMNS)).rename(columns=PLACE_COLUMNS)
+    reviews_df = reviews_df.reindex(columns=["Place ID", *REVIEW_COLUMNS]).rename(columns=REVIEW_COLUMNS)
+
+    # Replace missing values with None so they are written as JSON null (NaN is not valid JSON)
+    places_df = places_df.astype(object).where(places_df.notna(), None)
+    reviews_df = reviews_df.astype(object).where(reviews_df.notna(), None)
+
+    # Build each place's review list in a single groupby pass
+    reviews_by_place = {
+        place_id: group.drop(columns="Place ID").to_dict("records")
+        for place_id, group in reviews_df.groupby("Place ID", sort=False)
+    }
+
+    # Attach reviews to their places; places without reviews get an empty list
+    result = places_df.to_dict("records")
+    for place in result:
+        place["reviews"] = reviews_by_place.get(place["place_id"], [])
+
+    # Report places without reviews in a single summary line
+    missing = [place["place_id"] for place in result if place["place_id"] not in reviews_by_place]
+    if missing:
+        logger.warning(f"{len(missing)} places without reviews (sample: {missing[:5]})")
+
+    # Write result to JSON file; ".gz" paths get compact, fast-compressed JSON
+    if str(output_path).endswith(".gz"):
+        with gzip.open(output_path, "wb", compresslevel=1) as f:
+            f.write(orjson.dumps(result))
+    else:
+        Path(output_path).write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
     logger.info(f"Saved merged JSON to: {Path(output_path).resolve()}")
 
     print(f"JSON file saved to: {Path(output_path).resolve()}")
@@ -115,7 +159,7 @@ if __name__ == "__main__":
         generate_places_reviews_json(
             places_path=os.path.join(RAW_DATA_DIR, "places.csv"),         # Path to the raw places CSV file
             reviews_path=os.path.join(RAW_DATA_DIR, "reviews.csv"),       # Path to the raw reviews CSV file
-            output_path=os.path.join(PROCESSED_DATA_DIR, "places_reviews.json")  # Output path for the merged JSON file
+            output_path=os.path.join(PROCESSED_DATA_DIR, "places_reviews.json.gz")  # Output path for the merged JSON file
         )
         logger.info("Finished generate_places_reviews_json successfully.")
     except Exception as e:
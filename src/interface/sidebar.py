@@ -1,6 +1,5 @@
 import streamlit as st
-import sqlite3
-from config.paths import CHAT_HISTORY_DB_FPATH
+from core.memory import delete_session_messages
 from utils.logger import setup_logger
 
 # Initialize logger for app events
@@ -91,14 +90,9 @@ def clear_chat_history(session_id: str) -> None:
     -----
     - The database path is configured in `CHAT_HISTORY_DB_FPATH`.
     - The table `message_store` must exist with a `session_id` column.
+    - Uses the shared chat-history engine from `core.memory` (WAL mode, pooled connection).
     """
-    # Connect to local SQLite DB
-    conn = sqlite3.connect(CHAT_HISTORY_DB_FPATH)
-    cursor = conn.cursor()
-
     # Delete all messages for the given session
-    cursor.execute("DELETE FROM message_store WHERE session_id = ?", (session_id,))
-    conn.commit()
-    conn.close()
+    delete_session_messages(session_id)
 
     logger.info(f"User cleared the chat history for session: {session_id}")
\ No newline at end of file
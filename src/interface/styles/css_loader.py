@@ -2,6 +2,25 @@ import os
 import streamlit as st
 
 
+@st.cache_data(show_spinner=False)
+def _read_css(css_path: str) -> str:
+    """
+    Read a CSS file once and cache its content across Streamlit reruns.
+
+    Parameters
+    ----------
+    css_path : str
+        Absolute path to the CSS file.
+
+    Returns
+    -------
+    str
+        The content of the CSS file.
+    """
+    with open(css_path, "r") as f:
+        return f.read()
+
+
 def load_css(relative_path: str) -> None:
     """
     Load and apply custom CSS styling to the Streamlit app.
@@ -19,13 +38,13 @@ def load_css(relative_path: str) -> None:
     -----
     - The file must be a valid CSS file.
     - `unsafe_allow_html=True` is required for Streamlit to render custom styles.
+    - The file content is cached with `st.cache_data`, so reruns skip the disk read.
     """
     # Resolve the absolute path of the CSS file based on this script's location
     css_path = os.path.join(os.path.dirname(__file__), relative_path)
 
-    # Read the content of the CSS file
-    with open(css_path, "r") as f:
-        css = f.read()
+    # Read the content of the CSS file (cached after the first run)
+    css = _read_css(css_path)
 
     # Inject the CSS into the Streamlit app using HTML
     st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
\ No newline at end of file
@@ -1,8 +1,58 @@
+import atexit
 import logging
 import os
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from config.paths import LOGS_DIR
 
 
+@lru_cache(maxsize=None)
+def _get_log_queue(log_filename: str) -> SimpleQueue:
+    """
+    Return the queue feeding the file and console handlers of a log file.
+
+    Parameters
+    ----------
+    log_filename : str
+        Name of the file (inside the logs directory) where logs will be saved.
+
+    Returns
+    -------
+    SimpleQueue
+        Queue drained by a background `QueueListener`, created once per log file.
+
+    Notes
+    -----
+    - Handlers run on the listener thread, so callers never block on disk writes.
+    - The listener is stopped at interpreter exit, flushing any pending records.
+    """
+    # Ensure that the log directory exists
+    os.makedirs(LOGS_DIR, exist_ok=True)
+
+    # Full path to the log file
+    log_path = os.path.join(LOGS_DIR, log_filename)
+
+    # Define a log message format: timestamp, log level, and the message
+    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+
+    # Create a file handler to write logs to the log file
+    file_handler = logging.FileHandler(log_path)
+    file_handler.setFormatter(formatter)
+
+    # Create a stream handler to also print logs to the console
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    # Drain the queue into both handlers on a background thread
+    log_queue = SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, console_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    return log_queue
+
+
 def setup_logger(name: str, level: str = "INFO", log_filename: str = "rag_reviews.log") -> logging.Logger:
     """
     Set up and return a logger that writes logs to both the console and a file.
@@ -26,7 +76,7 @@ def setup_logger(name: str, level: str = "INFO", log_filename: str = "rag_review
     Returns
     -------
     logging.Logger
-        A configured logger instance with both file and console handlers.
+        A configured logger instance whose records reach both a file and the console.
 
     Notes
     -----
@@ -34,6 +84,8 @@ def setup_logger(name: str, level: str = "INFO", log_filename: str = "rag_review
       add duplicate handlers thanks to the hasHandlers() check.
     - Log files are saved in the directory specified by `LOGS_DIR`, defined in `config.paths`.
     - The log format includes timestamp, log level, and the log message.
+    - Records are handed to a `QueueHandler`; one background `QueueListener` per
+      log file does the actual file and console writes.
     """
 
     # Create or retrieve a logger with the specified name
@@ -47,24 +99,8 @@ def setup_logger(name: str, level: str = "INFO", log_filename: str = "rag_review
     log_level = getattr(logging, level.upper(), logging.INFO)
     logger.setLevel(log_level)
 
-    # Ensure that the log directory exists
-    os.makedirs(LOGS_DIR, exist_ok=True)
-
-    # Full path to the log file
-    log_path = os.path.join(LOGS_DIR, log_filename)
-
-    # Define a log message format: timestamp, log level, and the message
-    formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-
-    # Create a file handler to write logs to the log file
-    file_handler = logging.FileHandler(log_path)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-
-    # Create a stream handler to also print logs to the console
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    # Send records to the shared background writer of this log file
+    logger.addHandler(QueueHandler(_get_log_queue(log_filename)))
 
     # Return the fully configured logger
     return logger
\ No newline at end of file
@@ -1,5 +1,151 @@
-from langdetect import detect
+import hashlib
+import os
+import re
+import tempfile
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List
 from deep_translator import GoogleTranslator
+from config.paths import MODELS_DIR
+from utils.logger import setup_logger
+
+# Initialize logger for translation and language detection
+logger = setup_logger(name="translator", log_filename="translator.log")
+
+# Whole words specific to Portuguese (not shared with Spanish), used to skip the detector.
+# Bare spellings like "ã" or "ção" are left out: they also match place names such as
+# "São Paulo" or "Assunção" in queries written in other languages
+_PORTUGUESE_MARKERS = re.compile(
+    r"\b(você|vocês|não|é|uma|muito|onde|tem|têm|qual|quais)\b",
+    re.IGNORECASE,
+)
+
+# Compressed fastText language identification model (176 languages, ~1 MB)
+LID_MODEL_URL = "https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.ftz"
+LID_MODEL_PATH = os.path.join(MODELS_DIR, "lid.176.ftz")
+
+# Expected SHA-256 of the lid.176.ftz file; downloads that do not match are refused
+LID_MODEL_SHA256 = "8f3472cfe8738a7b6099e8e999c3cbfae0dcd15696aac7d7738a8039db603e83"
+
+# Seconds to wait on the model download before giving up
+LID_MODEL_DOWNLOAD_TIMEOUT = 30
+
+# Maximum number of translation requests in flight for `translate_batch`
+MAX_CONCURRENT_TRANSLATIONS = 8
+
+
+def ensure_lid_model() -> str:
+    """
+    Download the fastText language identification model if it is not present.
+
+    Returns
+    -------
+    str
+        Path to the local lid.176 model file.
+
+    Notes
+    -----
+    - Meant to run at app startup; this is the only place the model is downloaded,
+      so no user request waits on the network.
+    - The file is written to a temporary path and renamed only once it is complete
+      and its SHA-256 matches `LID_MODEL_SHA256`, so a truncated or altered
+      download never reaches `fasttext.load_model`.
+
+    Raises
+    ------
+    ValueError
+        If the downloaded file does not match the expected checksum.
+    """
+    if os.path.exists(LID_MODEL_PATH):
+        return LID_MODEL_PATH
+
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=MODELS_DIR, suffix=".part")
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as f, urllib.request.urlopen(LID_MODEL_URL, timeout=LID_MODEL_DOWNLOAD_TIMEOUT) as response:
+            while block := response.read(1 << 16):
+                digest.update(block)
+                f.write(block)
+
+        # Only move the file into place once its content is verified
+        if digest.hexdigest() != LID_MODEL_SHA256:
+            raise ValueError(
+                f"Checksum mismatch for {LID_MODEL_URL}: expected {LID_MODEL_SHA256}, got {digest.hexdigest()}"
+            )
+        os.replace(tmp_path, LID_MODEL_PATH)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    # Drop an "unavailable" result cached before the model was present
+    _get_lid_model.cache_clear()
+    return LID_MODEL_PATH
+
+
+@lru_cache(maxsize=1)
+def _get_lid_model():
+    """
+    Load the fastText language identification model once per process.
+
+    Returns
+    -------
+    fasttext.FastText._FastText or None
+        The lid.176 model from `MODELS_DIR`, or None if it is not available.
+
+    Notes
+    -----
+    - Never downloads: the model is fetched by `ensure_lid_model` at startup.
+    - A missing or unreadable model is cached as None, so later queries fall back
+      to "unknown" immediately instead of retrying on the request path.
+    """
+    if not os.path.exists(LID_MODEL_PATH):
+        logger.warning(f"Language identification model not found at {LID_MODEL_PATH}; detection disabled.")
+        return None
+
+    import fasttext  # Deferred until a language actually has to be detected
+
+    try:
+        return fasttext.load_model(LID_MODEL_PATH)
+    except Exception as e:
+        logger.warning(f"Failed to load language identification model: {e}", exc_info=True)
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _predict_language(text: str) -> str:
+    """
+    Predict the language of a text with the lid.176 model.
+
+    Parameters
+    ----------
+    text : str
+        The input text whose language needs to be detected.
+
+    Returns
+    -------
+    str
+        The predicted ISO 639-1 language code.
+
+    Notes
+    -----
+    - Only successful predictions are cached; errors propagate to the caller.
+
+    Raises
+    ------
+    LookupError
+        If the language identification model is not available.
+    """
+    model = _get_lid_model()
+    if model is None:
+        raise LookupError("Language identification model is not available")
+
+    # List input goes through fastText's batch path, which returns plain lists
+    # (the single-string path builds a NumPy array in a way NumPy 2 rejects)
+    labels, _ = model.predict([text.replace("\n", " ")], k=1)
+    return labels[0][0].replace("__label__", "")
+
 
 def detect_language(text: str) -> str:
     """
@@ -18,15 +164,23 @@ def detect_language(text: str) -> str:
 
     Notes
     -----
-    - Uses the `langdetect` library for language identification.
+    - Returns "pt" immediately when the text contains Portuguese-specific words,
+      skipping the detector for the most common input language.
+    - Otherwise uses fastText's lid.176 model, which is deterministic and runs in microseconds.
     - May be inaccurate for very short or ambiguous text.
+    - Successful detections are cached per text; failures are retried on the next call.
     """
+    if _PORTUGUESE_MARKERS.search(text):
+        return "pt"
+
     try:
-        return detect(text)
-    except:
+        return _predict_language(text)
+    except Exception:
         # Return a fallback value if detection fails
         return "unknown"
 
+
+@lru_cache(maxsize=4096)
 def translate(text: str, target_lang: str) -> str:
     """
     Translate the given text into the specified target language.
@@ -47,5 +201,38 @@ def translate(text: str, target_lang: str) -> str:
     -----
     - Uses GoogleTranslator from `deep_translator` with auto-detection of the source language.
     - Requires internet connection to function properly.
+    - Results are cached per (text, target_lang), so repeated inputs skip the network call.
+    - A new `GoogleTranslator` is built per call: it keeps request parameters in
+      instance state, so sharing one across threads could mix up concurrent requests.
+    """
+    return GoogleTranslator(source='auto', target=target_lang).translate(text)
+
+
+def translate_batch(texts: List[str], target_lang: str) -> List[str]:
+    """
+    Translate several texts into the target language concurrently.
+
+    Parameters
+    ----------
+    texts : list of str
+        The input texts to translate.
+    target_lang : str
+        The target language code (e.g., 'en' for English, 'pt' for Portuguese).
+
+    Returns
+    -------
+    list of str
+        The translated texts, in the same order as `texts`.
+
+    Notes
+    -----
+    - Each text goes through `translate`, so cached results are reused and every
+      worker uses its own `GoogleTranslator`.
+    - Requests run on up to `MAX_CONCURRENT_TRANSLATIONS` threads, overlapping
+      their network round-trips instead of paying them one after another.
     """
-    return GoogleTranslator(source='auto', target=target_lang).translate(text)
\ No newline at end of file
+    if len(texts) <= 1:
+        return [translate(text, target_lang) for text in texts]
+
+    with ThreadPoolExecutor(max_workers=min(len(texts), MAX_CONCURRENT_TRANSLATIONS)) as executor:
+        return list(executor.map(translate, texts, [target_lang] * len(texts)))
@@ -0,0 +1,22 @@
+import pytest
+from core.llm_helpers import needs_markdown_fix
+
+
+@pytest.mark.parametrize("text", [
+    "* Pet A\n* Pet B",
+    "-Pet A\n-Pet B",
+    "***Pet A***",
+    "** Pet A ** has great service",
+    "The best is ** Pet A**",
+])
+def test_needs_markdown_fix_detects_issues(text):
+    assert needs_markdown_fix(text)
+
+
+@pytest.mark.parametrize("text", [
+    "**Pet A** and **Pet B**",
+    "- **Pet A**: great service\n- **Pet B**: fair prices",
+    "Plain text answer.",
+])
+def test_needs_markdown_fix_accepts_well_formed_markdown(text):
+    assert not needs_markdown_fix(text)
@@ -0,0 +1,107 @@
+import hashlib
+import io
+import time
+
+import pytest
+
+from utils import translator
+
+
+class _FakeLidModel:
+    def predict(self, texts, k=1):
+        return [["__label__en"] for _ in texts], [[0.99] for _ in texts]
+
+
+def test_detect_language_does_not_cache_failures(monkeypatch):
+    translator._predict_language.cache_clear()
+
+    def failing_model():
+        raise OSError("model not available")
+
+    monkeypatch.setattr(translator, "_get_lid_model", failing_model)
+    assert translator.detect_language("Where can I buy dog food?") == "unknown"
+
+    monkeypatch.setattr(translator, "_get_lid_model", lambda: _FakeLidModel())
+    assert translator.detect_language("Where can I buy dog food?") == "en"
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, text):
+        self.text = text
+
+    def close(self):
+        pass
+
+
+def test_translate_batch_keeps_each_text_with_its_translation(monkeypatch):
+    translator.translate.cache_clear()
+
+    def fake_get(url, params=None, proxies=None):
+        time.sleep(0.01)  # Give concurrent requests a chance to interleave
+        return _FakeResponse(f'<div class="result-container">{params["q"].upper()}</div>')
+
+    monkeypatch.setattr("deep_translator.google.requests.get", fake_get)
+
+    texts = [f"review number {i}" for i in range(16)]
+    assert translator.translate_batch(texts, target_lang="en") == [text.upper() for text in texts]
+
+
+@pytest.mark.parametrize("text", [
+    "Best pet shop in São Bernardo?",
+    "dog grooming São Paulo",
+    "vet clinics near Assunção",
+])
+def test_detect_language_ignores_portuguese_place_names(monkeypatch, text):
+    translator._predict_language.cache_clear()
+    monkeypatch.setattr(translator, "_get_lid_model", lambda: _FakeLidModel())
+    assert translator.detect_language(text) == "en"
+
+
+@pytest.mark.parametrize("text", [
+    "Onde tem banho e tosa em São Paulo?",
+    "Qual pet shop você recomenda?",
+])
+def test_detect_language_short_circuits_portuguese(monkeypatch, text):
+    monkeypatch.setattr(translator, "_predict_language", None)  # Must not be reached
+    assert translator.detect_language(text) == "pt"
+
+
+def test_detect_language_never_downloads_on_request_path(monkeypatch, tmp_path):
+    translator._get_lid_model.cache_clear()
+    translator._predict_language.cache_clear()
+    monkeypatch.setattr(translator, "LID_MODEL_PATH", str(tmp_path / "lid.176.ftz"))
+
+    def fail_urlopen(*args, **kwargs):
+        raise AssertionError("detect_language must not download the model")
+
+    monkeypatch.setattr(translator.urllib.request, "urlopen", fail_urlopen)
+    for _ in range(3):
+        assert translator.detect_language("Where can I buy dog food?") == "unknown"
+    assert translator._get_lid_model.cache_info().misses == 1
+    translator._get_lid_model.cache_clear()
+
+
+def test_ensure_lid_model_refuses_checksum_mismatch(monkeypatch, tmp_path):
+    model_path = tmp_path / "lid.176.ftz"
+    monkeypatch.setattr(translator, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(translator, "LID_MODEL_PATH", str(model_path))
+    monkeypatch.setattr(translator.urllib.request, "urlopen", lambda *args, **kwargs: io.BytesIO(b"not a model"))
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        translator.ensure_lid_model()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_ensure_lid_model_accepts_matching_checksum(monkeypatch, tmp_path):
+    content = b"model bytes"
+    model_path = tmp_path / "lid.176.ftz"
+    monkeypatch.setattr(translator, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setattr(translator, "LID_MODEL_PATH", str(model_path))
+    monkeypatch.setattr(translator, "LID_MODEL_SHA256", hashlib.sha256(content).hexdigest())
+    monkeypatch.setattr(translator.urllib.request, "urlopen", lambda *args, **kwargs: io.BytesIO(content))
+
+    assert translator.ensure_lid_model() == str(model_path)
+    assert model_path.read_bytes() == content
+    translator._get_lid_model.cache_clear()